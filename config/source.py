@@ -3,6 +3,7 @@ config/source.py
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import os
 
@@ -18,6 +19,7 @@ def require_env(name: str) -> str:
     return value
 
 
+@lru_cache(maxsize=None)
 def project_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
@@ -27,6 +29,8 @@ class SourceConfig:
     METADATA_PATH: Path
     DATA_PATH: Path
     SEPARATOR: str = ";"
+    CHUNK_SIZE: int = 500_000
+    FACT_ID_ALGORITHM: str = "md5"
 
     @staticmethod
     def from_env() -> "SourceConfig":
@@ -35,6 +39,8 @@ class SourceConfig:
             METADATA_PATH=root / require_env("METADATA_FILE_NAME"),
             DATA_PATH=root / require_env("DATA_FILE_NAME"),
             SEPARATOR=os.getenv("CSV_SEPARATOR", ";"),
+            CHUNK_SIZE=int(os.getenv("CSV_CHUNK_SIZE", "500000")),
+            FACT_ID_ALGORITHM=os.getenv("FACT_ID_ALGORITHM", "md5"),
         )
 
 
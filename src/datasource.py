@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Iterator
 import pandas as pd
 
 from config.source import SourceConfig
@@ -11,4 +12,26 @@ class DataSource:
         self.config = config
     
     def read(self) -> pd.DataFrame:
-        return pd.read_csv(self.config.DATA_PATH, sep=self.config.SEPARATOR)
\ No newline at end of file
+        # memory_map: parse straight from the mapped file, no read() copies
+        return pd.read_csv(
+            self.config.DATA_PATH,
+            sep=self.config.SEPARATOR,
+            memory_map=True,
+        )
+    
+    def read_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield the data file in chunks of config.CHUNK_SIZE rows.
+        
+        Every column is read as str: inferring per chunk would type the
+        same column int64 in one chunk and str (or float64, with a missing
+        value) in the next. Transformers cast to their target types.
+        """
+        with pd.read_csv(
+            self.config.DATA_PATH,
+            sep=self.config.SEPARATOR,
+            memory_map=True,
+            chunksize=self.config.CHUNK_SIZE,
+            dtype=str,
+        ) as reader:
+            yield from reader
\ No newline at end of file
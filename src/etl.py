@@ -6,7 +6,7 @@ ETL Pipeline class for Netherlands mobility data.
 
 import logging
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterator
 
 import pandas as pd
 
@@ -46,32 +46,40 @@ class ETLPipeline:
         source_config: SourceConfig, 
         db_config: DatabaseConfig
     ):
+        # Fail before any table is written, not at the first fact chunk
+        algorithm = source_config.FACT_ID_ALGORITHM
+        if algorithm not in FactTransformer.HASH_ALGORITHMS:
+            raise ValueError(
+                f"Unsupported FACT_ID_ALGORITHM: {algorithm} "
+                f"(expected one of {sorted(FactTransformer.HASH_ALGORITHMS)})"
+            )
         self.source_config = source_config
         self.db_config = db_config
         self.logger = logging.getLogger(__name__)
         
-        # Data containers
+        # Data containers (facts are streamed chunk by chunk, never held whole)
         self.raw_dimensions: Dict[str, pd.DataFrame] = {}
-        self.raw_facts: pd.DataFrame = None
+        self.raw_fact_chunks: Iterator[pd.DataFrame] = None
         self.transformed_dimensions: Dict[str, pd.DataFrame] = {}
-        self.transformed_facts: pd.DataFrame = None
     
     def extract(self) -> "ETLPipeline":
-        """Extract data from sources."""
+        """Extract dimensions and open the fact data stream."""
         self.logger.info("[EXTRACT] Parsing metadata for dimensions...")
         parser = MetadataParser(self.source_config.METADATA_PATH)
         self.raw_dimensions = parser.parse()
         self.logger.info(f"[EXTRACT] Found {len(self.raw_dimensions)} sections")
         
-        self.logger.info("[EXTRACT] Reading main dataset...")
+        self.logger.info(
+            f"[EXTRACT] Streaming main dataset in chunks of "
+            f"{self.source_config.CHUNK_SIZE} rows..."
+        )
         datasource = DataSource(self.source_config)
-        self.raw_facts = datasource.read()
-        self.logger.info(f"[EXTRACT] Loaded {len(self.raw_facts)} fact rows")
+        self.raw_fact_chunks = datasource.read_chunks()
         
         return self
     
     def transform(self) -> "ETLPipeline":
-        """Transform extracted data."""
+        """Transform dimensions (facts are transformed per chunk on load)."""
         self.logger.info("[TRANSFORM] Transforming dimensions...")
         for name, df in self.raw_dimensions.items():
             if name not in self.DIMENSION_NAMES:
@@ -80,27 +88,19 @@ class ETLPipeline:
             self.transformed_dimensions[name] = transformer.transform()
             self.logger.info(f"  -> {name}: {len(df)} rows")
         
-        self.logger.info("[TRANSFORM] Transforming facts...")
-        transformer = FactTransformer(self.raw_facts)
-        self.transformed_facts = transformer.transform()
-        self.logger.info(f"  -> facts: {len(self.transformed_facts)} rows")
-        
         return self
     
     def validate(self) -> "ETLPipeline":
-        """Validate transformed data."""
-        self.logger.info("[VALIDATE] Running validations...")
-        validator = DataValidator(
-            self.transformed_dimensions, 
-            self.transformed_facts
-        )
-        validator.validate_all()
-        self.logger.info("[VALIDATE] All validations passed")
+        """Validate dimensions (facts are validated per chunk on load)."""
+        self.logger.info("[VALIDATE] Validating dimensions...")
+        validator = DataValidator(self.transformed_dimensions, None)
+        validator.validate_dimensions()
+        self.logger.info("[VALIDATE] Dimension validations passed")
         
         return self
     
     def load(self) -> ETLResult:
-        """Load data into database."""
+        """Load dimensions, then stream facts through transform/validate/load."""
         self.logger.info("[LOAD] Loading dimensions...")
         dim_loader = DimensionsLoader(self.db_config)
         dim_results = dim_loader.load(self.transformed_dimensions)
@@ -109,7 +109,17 @@ class ETLPipeline:
         
         self.logger.info("[LOAD] Loading facts...")
         fact_loader = FactLoader(self.db_config)
-        fact_count = fact_loader.load(self.transformed_facts)
+        # One validator for all chunks: dimension key sets are built once
+        fact_validator = DataValidator(self.transformed_dimensions, None)
+        fact_count = 0
+        for i, chunk in enumerate(self.raw_fact_chunks, start=1):
+            facts = FactTransformer(
+                chunk, hash_algorithm=self.source_config.FACT_ID_ALGORITHM
+            ).transform()
+            fact_validator.fact = facts
+            fact_validator.validate_fact()
+            fact_count += fact_loader.load(facts)
+            self.logger.info(f"  -> chunk {i}: {len(facts)} rows")
         self.logger.info(f"  -> fact_mobility: {fact_count} rows")
         
         return ETLResult(
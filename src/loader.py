@@ -2,19 +2,38 @@
 odin_mob.src.loader
 
 This module contains loader classes for dimensions and facts.
-Uses UPSERT (INSERT ... ON CONFLICT) for idempotency.
+Uses UPSERT (INSERT ... ON CONFLICT) for idempotency. Facts are bulk
+loaded with COPY into a staging table and merged in a single statement.
 """
 
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Tuple
 import pandas as pd
-from sqlalchemy import create_engine, Engine, text
+from sqlalchemy import create_engine, column, table, Connection, Engine, Executable, text
+from sqlalchemy.dialects.postgresql import insert, Insert
 
 from config.source import DatabaseConfig
 
 
+@lru_cache(maxsize=None)
+def _get_engine(connection_string: str) -> Engine:
+    """One engine (and connection pool) per database, shared by all loaders."""
+    # No executemany_mode: it is psycopg2-only and rejected by the
+    # psycopg (v3) dialect, whose executemany already pipelines
+    return create_engine(connection_string)
+
+
 class BaseLoader:
     """Base class for database loaders."""
     
+    # Rows sent per execute/COPY write; bounds memory per round trip
+    BATCH_SIZE = 5000
+    
+    # Statements keyed by (loader, name, schema), shared across instances:
+    # the SQL only depends on class constants and the schema
+    _STATEMENTS: Dict[Tuple[str, str, str], Executable] = {}
+    
     def __init__(self, config: DatabaseConfig):
         self.config = config
         self._engine: Engine = None
@@ -22,31 +41,111 @@ class BaseLoader:
     @property
     def engine(self) -> Engine:
         if self._engine is None:
-            self._engine = create_engine(self.config.connection_string)
+            self._engine = _get_engine(self.config.connection_string)
         return self._engine
     
-    def _build_upsert_query(
+    def _statement(self, name: str, build: Callable[[], Executable]) -> Executable:
+        """Return the cached statement for name, building it once."""
+        key = (type(self).__name__, name, self.config.SCHEMA)
+        statement = self._STATEMENTS.get(key)
+        if statement is None:
+            statement = self._STATEMENTS[key] = build()
+        return statement
+    
+    def _build_upsert_stmt(
         self, 
         table_name: str, 
         columns: List[str], 
         conflict_column: str,
         update_columns: List[str] = None
+    ) -> Insert:
+        """Build PostgreSQL UPSERT as a Core insert ... on_conflict_do_update."""
+        if update_columns is None:
+            update_columns = [c for c in columns if c != conflict_column]
+        
+        target = table(
+            table_name, 
+            *(column(c) for c in columns), 
+            schema=self.config.SCHEMA or None,
+        )
+        stmt = insert(target)
+        return stmt.on_conflict_do_update(
+            index_elements=[conflict_column],
+            set_={c: stmt.excluded[c] for c in update_columns},
+        )
+    
+    def _iter_record_batches(
+        self, 
+        df: pd.DataFrame, 
+        columns: List[str]
+    ) -> Iterator[List[Dict]]:
+        """Yield BATCH_SIZE lists of bind-parameter dicts, built lazily."""
+        frame = df[columns]
+        for start in range(0, len(frame), self.BATCH_SIZE):
+            batch = frame.iloc[start:start + self.BATCH_SIZE]
+            yield [
+                dict(zip(columns, row)) 
+                for row in batch.itertuples(index=False, name=None)
+            ]
+    
+    def _build_staging_query(self, table_name: str, staging_table: str) -> str:
+        """Build a transaction-scoped temp table mirroring the target."""
+        schema_prefix = f"{self.config.SCHEMA}." if self.config.SCHEMA else ""
+        
+        return f"""
+            CREATE TEMP TABLE {staging_table}
+            (LIKE {schema_prefix}{table_name} INCLUDING DEFAULTS)
+            ON COMMIT DROP
+        """
+    
+    def _build_merge_query(
+        self, 
+        table_name: str, 
+        staging_table: str,
+        columns: List[str], 
+        conflict_column: str,
+        update_columns: List[str] = None
     ) -> str:
-        """Build PostgreSQL UPSERT query."""
+        """
+        Build PostgreSQL UPSERT merging a staging table into the target.
+        
+        The staging rows must be unique on conflict_column: a single
+        INSERT cannot update the same target row twice.
+        """
         schema_prefix = f"{self.config.SCHEMA}." if self.config.SCHEMA else ""
         
         if update_columns is None:
             update_columns = [c for c in columns if c != conflict_column]
         
         cols_str = ", ".join(columns)
-        placeholders = ", ".join(f":{c}" for c in columns)
         updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
         
         return f"""
             INSERT INTO {schema_prefix}{table_name} ({cols_str})
-            VALUES ({placeholders})
+            SELECT {cols_str}
+            FROM {staging_table}
             ON CONFLICT ({conflict_column}) DO UPDATE SET {updates}
         """
+    
+    def _copy_rows(
+        self, 
+        conn: Connection, 
+        table_name: str, 
+        columns: List[str], 
+        df: pd.DataFrame
+    ) -> None:
+        """Stream DataFrame rows into a table with COPY FROM STDIN (CSV)."""
+        frame = df[columns]
+        
+        cols_str = ", ".join(columns)
+        copy_query = f"COPY {table_name} ({cols_str}) FROM STDIN WITH (FORMAT csv)"
+        with conn.connection.driver_connection.cursor() as cursor:
+            with cursor.copy(copy_query) as copy:
+                for start in range(0, len(frame), self.BATCH_SIZE):
+                    batch = frame.iloc[start:start + self.BATCH_SIZE]
+                    # Serialized by pandas' CSV writer; NaN/None become empty
+                    # fields, which COPY's CSV format reads as NULL
+                    copy.write(batch.to_csv(header=False, index=False))
 
 
 class DimensionsLoader(BaseLoader):
@@ -65,37 +164,56 @@ class DimensionsLoader(BaseLoader):
     DIMENSION_COLUMNS = ["key", "title", "description", "ingested_at"]
     
     def load(self, dimensions: Dict[str, pd.DataFrame]) -> Dict[str, int]:
-        """Load all dimensions with UPSERT."""
-        results = {}
-        for source_name, df in dimensions.items():
-            table_name = self.TABLE_MAPPING.get(source_name)
-            if not table_name:
-                continue
-            rows = self._upsert_table(df, table_name)
-            results[table_name] = rows
-        return results
-    
-    def _upsert_table(self, df: pd.DataFrame, table_name: str) -> int:
-        """UPSERT a single dimension table."""
-        query = self._build_upsert_query(
+        """Load all dimensions with UPSERT, one table per worker."""
+        tables = {
+            self.TABLE_MAPPING[source_name]: df
+            for source_name, df in dimensions.items()
+            if source_name in self.TABLE_MAPPING
+        }
+        if not tables:
+            return {}
+        
+        # Dimension tables are independent (no FKs between them): each
+        # worker checks out its own pooled connection and transaction, so
+        # round trips and server work overlap; the driver releases the GIL.
+        # The engine is resolved up front so workers never race to create it
+        engine = self.engine
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            futures = {
+                table_name: executor.submit(self._load_table, engine, df, table_name)
+                for table_name, df in tables.items()
+            }
+        
+        return {table_name: future.result() for table_name, future in futures.items()}
+    
+    def _load_table(self, engine: Engine, df: pd.DataFrame, table_name: str) -> int:
+        """UPSERT one dimension table in its own transaction."""
+        with engine.begin() as conn:
+            return self._upsert_table(conn, df, table_name)
+    
+    def _upsert_table(self, conn: Connection, df: pd.DataFrame, table_name: str) -> int:
+        """UPSERT a single dimension table on an open connection."""
+        # One statement for all batches and loads: SQLAlchemy's compiled
+        # cache hits and psycopg sends identical SQL, which it prepares
+        # server-side after prepare_threshold executions
+        statement = self._statement(table_name, lambda: self._build_upsert_stmt(
             table_name=table_name,
             columns=self.DIMENSION_COLUMNS,
             conflict_column="key",
             update_columns=["title", "description", "ingested_at"]
-        )
-        
-        records = df.to_dict(orient="records")
+        ))
         
-        with self.engine.begin() as conn:
-            conn.execute(text(query), records)
+        for records in self._iter_record_batches(df, self.DIMENSION_COLUMNS):
+            conn.execute(statement, records)
         
-        return len(records)
+        return len(df)
 
 
 class FactLoader(BaseLoader):
-    """Load fact table into PostgreSQL with UPSERT."""
+    """Load fact table into PostgreSQL with COPY + UPSERT."""
     
     TABLE_NAME = "fact_mobility"
+    STAGING_TABLE = "stg_fact_mobility"
     
     FACT_COLUMNS = [
         "fact_id",
@@ -125,17 +243,27 @@ class FactLoader(BaseLoader):
     ]
     
     def load(self, df: pd.DataFrame) -> int:
-        """UPSERT fact table."""
-        query = self._build_upsert_query(
+        """COPY facts into a staging table, then UPSERT into fact table."""
+        # Built once, then reused for every chunk
+        staging_statement = self._statement("staging", lambda: text(self._build_staging_query(
             table_name=self.TABLE_NAME,
+            staging_table=self.STAGING_TABLE
+        )))
+        merge_statement = self._statement("merge", lambda: text(self._build_merge_query(
+            table_name=self.TABLE_NAME,
+            staging_table=self.STAGING_TABLE,
             columns=self.FACT_COLUMNS,
             conflict_column="fact_id",
             update_columns=self.METRIC_COLUMNS
-        )
+        )))
         
-        records = df.to_dict(orient="records")
+        # Last occurrence wins, as when each row was upserted in turn
+        duplicated = df["fact_id"].duplicated(keep="last")
+        rows = df[~duplicated] if duplicated.any() else df
         
         with self.engine.begin() as conn:
-            conn.execute(text(query), records)
+            conn.execute(staging_statement)
+            self._copy_rows(conn, self.STAGING_TABLE, self.FACT_COLUMNS, rows)
+            conn.execute(merge_statement)
         
-        return len(records)
\ No newline at end of file
+        return len(df)
\ No newline at end of file
@@ -7,12 +7,57 @@ parsing a metadata file structured in named sections.
 
 import re
 import io
+import mmap
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import pandas as pd
 
 
+# Header line: optional UTF-8 BOM, then a quoted section name alone
+_SECTION_PATTERN = re.compile(rb'^\s*(?:\xef\xbb\xbf)?"([^"]+)"\s*$', re.MULTILINE)
+
+# Same header, matched on decoded text (encodings that are not ASCII-compatible)
+_TEXT_SECTION_PATTERN = re.compile(r'^\s*\ufeff?"([^"]+)"\s*$', re.MULTILINE)
+
+# Bytes the byte-level header regex relies on
+_ASCII_PROBE = b'"Header 1";\r\n\t '
+
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    """Whether ASCII bytes decode to the same characters in this encoding."""
+    try:
+        return _ASCII_PROBE.decode(encoding) == _ASCII_PROBE.decode("ascii")
+    except UnicodeDecodeError:
+        return False
+
+
+def _parse_block(
+    block: Union[bytes, str], separator: str, encoding: str
+) -> pd.DataFrame:
+    """
+    Parse a single section block into a DataFrame.
+
+    Parameters
+    ----------
+    block : Union[bytes, str]
+        Section content, starting with its quoted header line: raw bytes,
+        or text already decoded for encodings that are not ASCII-compatible.
+    separator : str
+        CSV separator.
+    encoding : str
+        File encoding, decoded by the C parser for byte blocks.
+    """
+    buffer = io.BytesIO(block) if isinstance(block, bytes) else io.StringIO(block)
+    return pd.read_csv(
+        buffer,
+        sep=separator,
+        skiprows=1,
+        quotechar='"',
+        encoding=encoding,
+    )
+
+
 class MetadataParser:
     """
     Parser for metadata files organized into quoted sections.
@@ -39,47 +84,66 @@ class MetadataParser:
         self._filepath = filepath
         self._separator = separator
         self._encoding = encoding
-        self._content: Optional[str] = None
+        self._content: Optional[Union[mmap.mmap, bytes, str]] = None
         self.dataframes: Dict[str, pd.DataFrame] = {}
 
     def _read_content(self) -> None:
-        """Read the entire content of the file."""
-        self._content = self._filepath.read_text(encoding=self._encoding)
+        """
+        Map the file read-only; decoding is left to read_csv per block.
 
-    def _find_sections(self) -> List[str]:
-        """Find all section headers in the metadata file."""
-        return re.findall(
-            r'^\s*\ufeff?"([^"]+)"\s*$',
-            self._content,
-            re.MULTILINE,
-        )
+        Encodings that are not ASCII-compatible (e.g. UTF-16) cannot be
+        scanned for headers byte-wise, so the file is decoded up front.
+        """
+        if not _is_ascii_compatible(self._encoding):
+            with open(self._filepath, "r", encoding=self._encoding, newline="") as f:
+                self._content = f.read()
+            return
+        with open(self._filepath, "rb") as f:
+            # mmap rejects empty files
+            if f.seek(0, io.SEEK_END) == 0:
+                self._content = b""
+            else:
+                self._content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _find_sections(self) -> List[re.Match]:
+        """Find all section headers (name and offset) in one regex sweep."""
+        if isinstance(self._content, str):
+            return list(_TEXT_SECTION_PATTERN.finditer(self._content))
+        return list(_SECTION_PATTERN.finditer(self._content))
 
     def parse(self) -> Dict[str, pd.DataFrame]:
-        """Parse the metadata file and load each section into a DataFrame."""
-        self._read_content()
-        sections = self._find_sections()
-
-        for i, marker in enumerate(sections):
-            full_marker = f'"{marker}"'
-            start = self._content.find(full_marker + "\n")
-
-            if start == -1:
-                continue
-
-            end = (
-                self._content.find(f'"{sections[i + 1]}"' + "\n")
-                if i + 1 < len(sections)
-                else len(self._content)
-            )
-
-            block_text = self._content[start:end].strip()
+        """
+        Parse the metadata file and load each section into a DataFrame.
 
+        Section blocks are sliced from the mapped file, then parsed one by
+        one; a section that fails to parse is reported and skipped.
+        """
+        self._read_content()
+        blocks: Dict[str, Union[bytes, str]] = {}
+        try:
+            sections = self._find_sections()
+
+            # A block runs from its header to the next header (or end of
+            # file); slicing the map copies only the block's bytes
+            for i, match in enumerate(sections):
+                end = (
+                    sections[i + 1].start()
+                    if i + 1 < len(sections)
+                    else len(self._content)
+                )
+                marker = match.group(1)
+                if isinstance(marker, bytes):
+                    marker = marker.decode(self._encoding)
+                blocks[marker] = self._content[match.start():end].strip()
+        finally:
+            if isinstance(self._content, mmap.mmap):
+                self._content.close()
+            self._content = None
+
+        for marker, block in blocks.items():
             try:
-                self.dataframes[marker] = pd.read_csv(
-                    io.StringIO(block_text),
-                    sep=self._separator,
-                    skiprows=1,
-                    quotechar='"',
+                self.dataframes[marker] = _parse_block(
+                    block, self._separator, self._encoding
                 )
             except Exception as e:
                 print(f"Error while parsing section '{marker}': {e}")
@@ -4,7 +4,11 @@ odin_mob.src.transformer
 This module contains transformer classes for dimensions and facts.
 """
 
+import functools
 import hashlib
+from typing import List
+
+import numpy as np
 import pandas as pd
 
 
@@ -17,43 +21,42 @@ class DimensionTransformer:
         "Description": "description",
     }
     
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
-    
-    def rename_columns(self) -> "DimensionTransformer":
-        """Standardize column names to lowercase."""
-        self.df = self.df.rename(columns=self.COLUMN_MAPPING)
-        return self
+    STRING_COLUMNS = ["key", "title", "description"]
     
-    def clean_strings(self) -> "DimensionTransformer":
-        """Trim whitespace and normalize strings."""
-        for col in ["key", "title", "description"]:
-            if col in self.df.columns:
-                # Convert to string first, then strip
-                self.df[col] = self.df[col].astype(str).str.strip()
-                # Replace 'nan' string with None
-                self.df[col] = self.df[col].replace({"nan": None, "None": None})
-        return self
+    # Values that mean "no value" once stripped
+    NULL_TOKENS = ["", "nan", "None"]
     
-    def handle_nulls(self) -> "DimensionTransformer":
-        """Replace empty strings with None."""
-        self.df = self.df.replace({"": None, " ": None})
-        return self
+    def __init__(self, df: pd.DataFrame):
+        # Shallow copy: shares the input's data (copy-on-write duplicates
+        # only columns that get written), but never the caller's frame
+        self.df = df.copy(deep=False)
     
-    def add_audit_columns(self) -> "DimensionTransformer":
-        """Add ingestion timestamp."""
-        self.df["ingested_at"] = pd.Timestamp.now(tz="UTC")
-        return self
+    def _clean_string(self, series: pd.Series) -> pd.Series:
+        """Trim whitespace and null out missing/placeholder strings."""
+        stripped = series.astype(str).str.strip()
+        # One mask for NaN and every null token, straight to None
+        keep = stripped.notna() & ~stripped.isin(self.NULL_TOKENS)
+        return stripped.astype(object).where(keep, None)
     
     def transform(self) -> pd.DataFrame:
-        """Run full pipeline."""
-        return (
-            self.rename_columns()
-                .clean_strings()
-                .handle_nulls()
-                .add_audit_columns()
-                .df
-        )
+        """
+        Run full pipeline.
+        
+        Rename, string cleaning, null handling and the audit column are
+        fused into one rename + one assign, so each output column is
+        allocated once.
+        """
+        df = self.df.rename(columns=self.COLUMN_MAPPING)
+        
+        columns = {}
+        for col in df.columns:
+            if col in self.STRING_COLUMNS:
+                columns[col] = self._clean_string(df[col])
+            else:
+                # Anything else the section carries: empty strings -> None
+                columns[col] = df[col].replace({"": None, " ": None})
+        
+        return df.assign(**columns, ingested_at=pd.Timestamp.now(tz="UTC"))
 
 
 class FactTransformer:
@@ -91,74 +94,88 @@ class FactTransformer:
         "distance_yearly",
         "time_yearly",
     ]
-
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
     
-    def rename_columns(self) -> "FactTransformer":
-        """Map source columns to target names."""
-        self.df = self.df.rename(columns=self.COLUMN_MAPPING)
-        return self
-    
-    def drop_unused_columns(self) -> "FactTransformer":
-        """Remove columns not in data model."""
-        keep = ["fact_id"] + self.FK_COLUMNS + self.METRIC_COLUMNS
-        self.df = self.df[[c for c in keep if c in self.df.columns]]
-        return self
-    
-    def compute_fact_id(self) -> "FactTransformer":
-        """Generate MD5 hash from dimension keys."""
-        self.df["fact_id"] = self.df.apply(self._hash_row, axis=1)
-        return self
-    
-    def _hash_row(self, row: pd.Series) -> str:
-        key_string = "|".join(str(row[col]) for col in self.FK_COLUMNS)
-        return hashlib.md5(key_string.encode()).hexdigest()
+    # 16-byte digests -> 32 hex chars, the width of fact_id CHAR(32).
+    # md5 is the default: changing it re-keys every existing fact row.
+    HASH_ALGORITHMS = {
+        "md5": hashlib.md5,
+        "blake2s": functools.partial(hashlib.blake2s, digest_size=16),
+    }
+
+    def __init__(self, df: pd.DataFrame, hash_algorithm: str = "md5"):
+        if hash_algorithm not in self.HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
+        # Shallow copy: columns are only read; output is built in a new frame
+        self.df = df.copy(deep=False)
+        self.hash_algorithm = hash_algorithm
+    
+    def _generate_fact_id(self, keys: List[pd.Series]) -> List[str]:
+        """Hash the pipe-joined dimension keys of each row."""
+        digest = self.HASH_ALGORITHMS[self.hash_algorithm]
+        # Join and hash in one pass over the key arrays: one str per row.
+        # Missing keys hash as "nan", as str(value) did in the row-wise
+        # hash, so fact_ids of such rows stay stable
+        arrays = [k.fillna("nan").to_numpy(dtype=object) for k in keys]
+        return [
+            digest("|".join(parts).encode()).hexdigest()
+            for parts in zip(*arrays)
+        ]
+    
+    @staticmethod
+    def _strip_keys(series: pd.Series) -> pd.Series:
+        """Cast to str and strip, once per distinct key rather than per row."""
+        # Dimension keys repeat heavily across fact rows
+        codes, uniques = pd.factorize(series)
+        stripped = pd.Index(uniques).astype(str).str.strip()
+        return pd.Series(
+            stripped.take(codes, allow_fill=True, fill_value=np.nan),
+            index=series.index,
+            dtype="str",
+        )
     
-    def cast_types(self) -> "FactTransformer":
-        """Cast columns to correct types."""
-        for col in self.FK_COLUMNS:
-            self.df[col] = self.df[col].astype(str).str.strip()
-        
-        for col in self.METRIC_COLUMNS:
-            self.df[col] = pd.to_numeric(self.df[col], errors="coerce")
+    @staticmethod
+    def _to_float(series: pd.Series) -> pd.Series:
+        """Coerce metrics to float64, parsing each distinct string once."""
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype("float64")
+        # CBS metrics are padded strings with few distinct values per
+        # column; "." and anything else non-numeric coerce to NaN
+        codes, uniques = pd.factorize(series)
+        values = pd.to_numeric(pd.Series(uniques), errors="coerce").to_numpy(dtype="float64")
+        # Trailing NaN slot: missing values (code -1) land on it
+        return pd.Series(np.append(values, np.nan)[codes], index=series.index)
+    
+    def _transform_fused(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the output in a single pass over the columns.
         
-        return self
-    
-    def handle_nulls(self) -> "FactTransformer":
-        """Handle missing values in metrics - convert NaN to None for PostgreSQL."""
-        # Replace "." string with NaN first
-        self.df[self.METRIC_COLUMNS] = self.df[self.METRIC_COLUMNS].replace({".": float("nan")})
+        Each source column is read once and each output column written
+        once into a local dict; the frame is assembled at the end, in
+        database column order. "." and other non-numeric metrics become
+        NaN through to_numeric's coercion.
+        """
+        source = {target: src for src, target in self.COLUMN_MAPPING.items()}
         
-        # Convert NaN to None (which becomes NULL in PostgreSQL)
-        self.df = self.df.where(pd.notnull(self.df), None)
+        keys = {
+            col: self._strip_keys(df[source[col]])
+            for col in self.FK_COLUMNS
+        }
+        # float64 even when a chunk holds only integers (no "." sentinel)
+        metrics = {
+            col: self._to_float(df[source[col]])
+            for col in self.METRIC_COLUMNS
+        }
         
-        return self
-    
-    def add_audit_columns(self) -> "FactTransformer":
-        """Add ingestion timestamp."""
-        self.df["ingested_at"] = pd.Timestamp.now(tz="UTC")
-        return self
-    
-    def reorder_columns(self) -> "FactTransformer":
-        """Match database column order."""
-        column_order = (
-            ["fact_id"] 
-            + self.FK_COLUMNS 
-            + self.METRIC_COLUMNS 
-            + ["ingested_at"]
+        return pd.DataFrame(
+            {
+                "fact_id": self._generate_fact_id(list(keys.values())),
+                **keys,
+                **metrics,
+                "ingested_at": pd.Timestamp.now(tz="UTC"),
+            },
+            index=df.index,
         )
-        self.df = self.df[[c for c in column_order if c in self.df.columns]]
-        return self
     
     def transform(self) -> pd.DataFrame:
         """Run full transformation pipeline."""
-        return (
-            self.rename_columns()
-                .cast_types()
-                .handle_nulls()
-                .compute_fact_id()
-                .add_audit_columns()
-                .reorder_columns()
-                .df
-        )
\ No newline at end of file
+        return self._transform_fused(self.df)
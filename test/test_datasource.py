@@ -256,4 +256,56 @@ class TestDataSource:
         df1.loc[0, "name"] = "modified"
         
         # df2 should be unchanged
-        assert df2.iloc[0]["name"] == "foo"
\ No newline at end of file
+        assert df2.iloc[0]["name"] == "foo"
+    
+    def test_read_chunks(self, sample_config):
+        """
+        Test reading the file in chunks.
+        
+        Given: A config with CHUNK_SIZE smaller than the file
+        When: read_chunks() is consumed
+        Then: Yields DataFrames that together hold every row in order
+        """
+        config = SourceConfig(
+            DATA_PATH=sample_config.DATA_PATH,
+            METADATA_PATH=sample_config.METADATA_PATH,
+            SEPARATOR=";",
+            CHUNK_SIZE=2,
+        )
+        
+        chunks = list(DataSource(config).read_chunks())
+        
+        assert [len(c) for c in chunks] == [2, 1]
+        assert list(chunks[0].columns) == ["id", "name", "value"]
+        assert pd.concat(chunks)["name"].tolist() == ["foo", "bar", "baz"]
+    
+    def test_read_chunks_consistent_dtypes(self, temp_csv, sample_config):
+        """
+        Test every chunk types its columns the same way.
+        
+        Given: A key column that is numeric-looking in one chunk, missing
+               a value in another and alphanumeric in the last
+        When: read_chunks() is consumed
+        Then: Every chunk holds the column as str, with values unchanged
+        """
+        data_path = temp_csv(textwrap.dedent("""\
+            key;value
+            2030230;1
+            2030240;2
+            ;3
+            2030250;4
+            A048710;5
+        """))
+        config = SourceConfig(
+            DATA_PATH=data_path,
+            METADATA_PATH=sample_config.METADATA_PATH,
+            SEPARATOR=";",
+            CHUNK_SIZE=2,
+        )
+        
+        chunks = list(DataSource(config).read_chunks())
+        
+        assert {str(c["key"].dtype) for c in chunks} == {"str"}
+        assert pd.concat(chunks)["key"].fillna("").tolist() == [
+            "2030230", "2030240", "", "2030250", "A048710",
+        ]
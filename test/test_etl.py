@@ -0,0 +1,134 @@
+"""
+test/test_etl.py
+
+Unit tests for the ETLPipeline fact streaming loop.
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+from unittest.mock import patch
+from pandera.errors import SchemaError
+
+from config.source import SourceConfig
+from src.etl import ETLPipeline
+from src.transformer import DimensionTransformer
+
+pytestmark = [
+    pytest.mark.integration,
+]
+
+
+# ============== FIXTURES ==============
+
+# Dimension keys as CBS ships them (raw source column -> keys)
+_DIM_KEYS = {
+    "TravelMotives": ["T001080", "2030230"],
+    "Population": ["A048710"],
+    "TravelModes": ["T001093"],
+    "Margins": ["MW00000"],
+    "RegionCharacteristics": ["NL01"],
+    "Periods": ["2018JJ00", "2019JJ00"],
+}
+
+
+def _raw_chunk(motives, periods):
+    """A raw fact chunk as DataSource.read_chunks yields it (all str)."""
+    n = len(motives)
+    return pd.DataFrame({
+        "ID": [str(i) for i in range(n)],
+        "TravelMotives": motives,
+        "Population": ["A048710"] * n,
+        "TravelModes": ["T001093"] * n,
+        "Margins": ["MW00000"] * n,
+        "RegionCharacteristics": ["NL01    "] * n,
+        "Periods": periods,
+        "Trips_1": ["    2.78"] * n,
+        "DistanceTravelled_2": ["   36.16"] * n,
+        "TimeTravelled_3": ["       ."] * n,
+        "Trips_4": ["    1015"] * n,
+        "DistanceTravelled_5": ["   13200"] * n,
+        "TimeTravelled_6": ["   453.8"] * n,
+    }, dtype=str)
+
+
+@pytest.fixture
+def pipeline():
+    """A pipeline with transformed dimensions and no fact stream yet."""
+    config = SourceConfig(
+        METADATA_PATH=Path("metadata.csv"),
+        DATA_PATH=Path("data.csv"),
+    )
+    etl = ETLPipeline(config, db_config=None)
+    etl.transformed_dimensions = {
+        name: DimensionTransformer(pd.DataFrame({
+            "Key": keys,
+            "Title": keys,
+            "Description": keys,
+        })).transform()
+        for name, keys in _DIM_KEYS.items()
+    }
+    return etl
+
+
+@pytest.fixture
+def loaders():
+    """Patch both loaders; FactLoader.load reports the rows it was given."""
+    with patch("src.etl.DimensionsLoader") as dims, patch("src.etl.FactLoader") as facts:
+        dims.return_value.load.return_value = {"dim_travel_motives": 2}
+        facts.return_value.load.side_effect = len
+        yield dims.return_value, facts.return_value
+
+
+# ============== TESTS ==============
+
+class TestLoad:
+    """Tests for ETLPipeline.load()."""
+
+    @pytest.mark.happy_path
+    def test_loads_every_chunk(self, pipeline, loaders):
+        """Test each chunk is transformed, validated and loaded in order."""
+        dims_loader, fact_loader = loaders
+        pipeline.raw_fact_chunks = iter([
+            _raw_chunk(["T001080", "2030230"], ["2018JJ00", "2019JJ00"]),
+            _raw_chunk(["2030230"], ["2019JJ00"]),
+        ])
+
+        result = pipeline.load()
+
+        dims_loader.load.assert_called_once_with(pipeline.transformed_dimensions)
+        loaded = [c.args[0] for c in fact_loader.load.call_args_list]
+        assert [len(f) for f in loaded] == [2, 1]
+        assert loaded[0]["region_key"].tolist() == ["NL01", "NL01"]
+        assert loaded[1]["travel_motive_key"].tolist() == ["2030230"]
+        assert result.facts_loaded == 3
+
+    @pytest.mark.error_handling
+    def test_invalid_chunk_stops_before_load(self, pipeline, loaders):
+        """Test a chunk failing FK validation is never loaded."""
+        _, fact_loader = loaders
+        pipeline.raw_fact_chunks = iter([
+            _raw_chunk(["T001080"], ["2018JJ00"]),
+            _raw_chunk(["T001080"], ["2099JJ00"]),
+        ])
+
+        with pytest.raises(SchemaError):
+            pipeline.load()
+
+        assert fact_loader.load.call_count == 1
+
+
+class TestInit:
+    """Tests for ETLPipeline.__init__()."""
+
+    @pytest.mark.error_handling
+    def test_unknown_hash_algorithm_rejected(self):
+        """Test a bad FACT_ID_ALGORITHM fails before anything is loaded."""
+        config = SourceConfig(
+            METADATA_PATH=Path("metadata.csv"),
+            DATA_PATH=Path("data.csv"),
+            FACT_ID_ALGORITHM="sha1",
+        )
+
+        with pytest.raises(ValueError, match="FACT_ID_ALGORITHM"):
+            ETLPipeline(config, db_config=None)
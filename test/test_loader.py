@@ -8,8 +8,9 @@ import pytest
 import pandas as pd
 from unittest.mock import MagicMock, patch, call
 from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql
 
-from src.loader import BaseLoader, DimensionsLoader, FactLoader
+from src.loader import BaseLoader, DimensionsLoader, FactLoader, _get_engine
 from config.source import DatabaseConfig
 
 pytestmark = pytest.mark.loader
@@ -17,6 +18,16 @@ pytestmark = pytest.mark.loader
 
 # ============== FIXTURES ==============
 
+@pytest.fixture(autouse=True)
+def clear_loader_caches():
+    """Engines and statements are cached across loaders; isolate each test."""
+    _get_engine.cache_clear()
+    BaseLoader._STATEMENTS.clear()
+    yield
+    _get_engine.cache_clear()
+    BaseLoader._STATEMENTS.clear()
+
+
 @pytest.fixture
 def mock_config():
     return DatabaseConfig(
@@ -102,25 +113,43 @@ class TestBaseLoader:
         mock_create_engine.assert_called_once()
 
     @pytest.mark.happy_path
-    def test_build_upsert_query_basic(self, mock_config):
+    @patch("src.loader.create_engine")
+    def test_engine_shared_per_connection_string(self, mock_create_engine, mock_config):
+        mock_create_engine.side_effect = lambda url: MagicMock(url=url)
+
+        dim_engine = DimensionsLoader(mock_config).engine
+        fact_engine = FactLoader(mock_config).engine
+        other_engine = BaseLoader(
+            DatabaseConfig(
+                USERNAME="u", PASSWORD="p", DATABASE="other_db", SCHEMA="s"
+            )
+        ).engine
+
+        assert dim_engine is fact_engine
+        assert other_engine is not dim_engine
+        assert mock_create_engine.call_count == 2
+
+    @pytest.mark.happy_path
+    def test_build_upsert_stmt_basic(self, mock_config):
         loader = BaseLoader(mock_config)
         
-        query = loader._build_upsert_query(
+        stmt = loader._build_upsert_stmt(
             table_name="dim_test",
             columns=["key", "title", "description"],
             conflict_column="key",
             update_columns=["title", "description"]
         )
+        query = stmt.compile(dialect=postgresql.dialect()).string
         
         assert "INSERT INTO test_schema.dim_test" in query
         assert "(key, title, description)" in query
-        assert "VALUES (:key, :title, :description)" in query
+        assert "VALUES (%(key)s, %(title)s, %(description)s)" in query
         assert "ON CONFLICT (key) DO UPDATE SET" in query
-        assert "title = EXCLUDED.title" in query
-        assert "description = EXCLUDED.description" in query
+        assert "title = excluded.title" in query
+        assert "description = excluded.description" in query
 
     @pytest.mark.edge_case
-    def test_build_upsert_query_no_schema(self, mock_config):
+    def test_build_upsert_stmt_no_schema(self, mock_config):
         # Config without schema
         config_no_schema = DatabaseConfig(
             USERNAME="test_user",
@@ -132,16 +161,43 @@ class TestBaseLoader:
         )
         loader = BaseLoader(config_no_schema)
         
-        query = loader._build_upsert_query(
+        stmt = loader._build_upsert_stmt(
             table_name="dim_test",
             columns=["key", "title"],
             conflict_column="key",
         )
+        query = stmt.compile(dialect=postgresql.dialect()).string
         
         # Should not have schema prefix
         assert "INSERT INTO dim_test" in query
         assert ".dim_test" not in query
 
+    @pytest.mark.happy_path
+    def test_build_merge_query(self, mock_config):
+        loader = BaseLoader(mock_config)
+
+        query = loader._build_merge_query(
+            table_name="fact_test",
+            staging_table="stg_fact_test",
+            columns=["fact_id", "value"],
+            conflict_column="fact_id",
+        )
+
+        assert "INSERT INTO test_schema.fact_test (fact_id, value)" in query
+        assert "SELECT fact_id, value" in query
+        assert "FROM stg_fact_test" in query
+        assert "ON CONFLICT (fact_id) DO UPDATE SET value = EXCLUDED.value" in query
+
+    @pytest.mark.happy_path
+    def test_build_staging_query(self, mock_config):
+        loader = BaseLoader(mock_config)
+
+        query = loader._build_staging_query("fact_test", "stg_fact_test")
+
+        assert "CREATE TEMP TABLE stg_fact_test" in query
+        assert "LIKE test_schema.fact_test" in query
+        assert "ON COMMIT DROP" in query
+
 
 # ============== DIMENSIONS LOADER TESTS ==============
 
@@ -168,6 +224,8 @@ class TestDimensionsLoader:
 
         # Verify execute called for each dimension
         assert fake_conn.execute.call_count == 2
+        # One transaction per dimension table
+        assert fake_engine.begin.call_count == 2
 
     @pytest.mark.happy_path
     @patch("src.loader.create_engine")
@@ -190,9 +248,53 @@ class TestDimensionsLoader:
             # Check UPSERT structure
             assert "INSERT INTO" in query_text
             assert "ON CONFLICT (key) DO UPDATE SET" in query_text
-            assert "title = EXCLUDED.title" in query_text
-            assert "description = EXCLUDED.description" in query_text
-            assert "ingested_at = EXCLUDED.ingested_at" in query_text
+            assert "title = excluded.title" in query_text
+            assert "description = excluded.description" in query_text
+            assert "ingested_at = excluded.ingested_at" in query_text
+
+    @pytest.mark.edge_case
+    @patch("src.loader.create_engine")
+    def test_load_executes_in_batches(self, mock_create_engine, mock_config, sample_dimensions):
+        fake_conn = MagicMock()
+        fake_engine = MagicMock()
+        fake_engine.begin.return_value.__enter__ = MagicMock(return_value=fake_conn)
+        fake_engine.begin.return_value.__exit__ = MagicMock(return_value=False)
+        mock_create_engine.return_value = fake_engine
+
+        loader = DimensionsLoader(mock_config)
+        loader.BATCH_SIZE = 1
+        results = loader.load(sample_dimensions)
+
+        assert results == {"dim_population": 2, "dim_periods": 2}
+        # 2 dimensions x 2 rows, one row per batch
+        assert fake_conn.execute.call_count == 4
+        assert all(len(c[0][1]) == 1 for c in fake_conn.execute.call_args_list)
+        # Same statement object reused for every batch of a table
+        statements = {id(c[0][0]) for c in fake_conn.execute.call_args_list}
+        assert len(statements) == 2
+
+    @pytest.mark.happy_path
+    @patch("src.loader.create_engine")
+    def test_load_passes_records_as_dict(self, mock_create_engine, mock_config, sample_dimensions):
+        fake_conn = MagicMock()
+        fake_engine = MagicMock()
+        fake_engine.begin.return_value.__enter__ = MagicMock(return_value=fake_conn)
+        fake_engine.begin.return_value.__exit__ = MagicMock(return_value=False)
+        mock_create_engine.return_value = fake_engine
+
+        loader = DimensionsLoader(mock_config)
+        loader.load(sample_dimensions)
+
+        # Tables load concurrently, so pick the population batch by content
+        records = next(
+            c[0][1] for c in fake_conn.execute.call_args_list
+            if "dim_population" in str(c[0][0])
+        )
+
+        assert isinstance(records, list)
+        assert len(records) == 2
+        assert list(records[0]) == DimensionsLoader.DIMENSION_COLUMNS
+        assert records[0]["key"] == "P1"
 
     @pytest.mark.edge_case
     @patch("src.loader.create_engine")
@@ -247,7 +349,23 @@ class TestFactLoader:
         result = loader.load(sample_facts)
 
         assert result == 2
-        fake_conn.execute.assert_called_once()
+        # One statement to create the staging table, one to merge it
+        assert fake_conn.execute.call_count == 2
+
+    @pytest.mark.happy_path
+    @patch("src.loader.create_engine")
+    def test_load_reuses_statements_across_chunks(self, mock_create_engine, mock_config, sample_facts):
+        fake_conn = MagicMock()
+        fake_engine = MagicMock()
+        fake_engine.begin.return_value.__enter__ = MagicMock(return_value=fake_conn)
+        fake_engine.begin.return_value.__exit__ = MagicMock(return_value=False)
+        mock_create_engine.return_value = fake_engine
+
+        FactLoader(mock_config).load(sample_facts)
+        FactLoader(mock_config).load(sample_facts)
+
+        first, second = [c[0][0] for c in fake_conn.execute.call_args_list[::2]]
+        assert first is second
 
     @pytest.mark.happy_path
     @patch("src.loader.create_engine")
@@ -278,7 +396,7 @@ class TestFactLoader:
 
     @pytest.mark.happy_path
     @patch("src.loader.create_engine")
-    def test_load_passes_records_as_dict(self, mock_create_engine, mock_config, sample_facts):
+    def test_load_copies_rows_into_staging_table(self, mock_create_engine, mock_config, sample_facts):
         fake_conn = MagicMock()
         fake_engine = MagicMock()
         fake_engine.begin.return_value.__enter__ = MagicMock(return_value=fake_conn)
@@ -288,14 +406,77 @@ class TestFactLoader:
         loader = FactLoader(mock_config)
         loader.load(sample_facts)
 
-        # Second argument should be list of dicts
-        records = fake_conn.execute.call_args[0][1]
-        
-        assert isinstance(records, list)
-        assert len(records) == 2
-        assert isinstance(records[0], dict)
-        assert "fact_id" in records[0]
-        assert "trips_daily" in records[0]
+        cursor = fake_conn.connection.driver_connection.cursor.return_value.__enter__.return_value
+        copy = cursor.copy.return_value.__enter__.return_value
+
+        copy_sql = cursor.copy.call_args[0][0]
+        assert copy_sql.startswith("COPY stg_fact_mobility (fact_id, travel_motive_key")
+        assert "FORMAT csv" in copy_sql
+
+        # One CSV line per fact, in FACT_COLUMNS order
+        rows = "".join(c[0][0] for c in copy.write.call_args_list).splitlines()
+        assert len(rows) == 2
+        fields = rows[0].split(",")
+        assert fields[0] == "abc123def456abc123def456abc12345"
+        assert fields[FactLoader.FACT_COLUMNS.index("trips_daily")] == "10.5"
+
+    @pytest.mark.edge_case
+    @patch("src.loader.create_engine")
+    def test_load_copies_in_batches(self, mock_create_engine, mock_config, sample_facts):
+        fake_conn = MagicMock()
+        fake_engine = MagicMock()
+        fake_engine.begin.return_value.__enter__ = MagicMock(return_value=fake_conn)
+        fake_engine.begin.return_value.__exit__ = MagicMock(return_value=False)
+        mock_create_engine.return_value = fake_engine
+
+        loader = FactLoader(mock_config)
+        loader.BATCH_SIZE = 1
+        result = loader.load(sample_facts)
+
+        cursor = fake_conn.connection.driver_connection.cursor.return_value.__enter__.return_value
+        copy = cursor.copy.return_value.__enter__.return_value
+
+        assert result == 2
+        assert copy.write.call_count == 2
+
+    @pytest.mark.edge_case
+    @patch("src.loader.create_engine")
+    def test_load_copies_nan_as_null(self, mock_create_engine, mock_config, sample_facts):
+        fake_conn = MagicMock()
+        fake_engine = MagicMock()
+        fake_engine.begin.return_value.__enter__ = MagicMock(return_value=fake_conn)
+        fake_engine.begin.return_value.__exit__ = MagicMock(return_value=False)
+        mock_create_engine.return_value = fake_engine
+
+        sample_facts.loc[0, "trips_daily"] = float("nan")
+        FactLoader(mock_config).load(sample_facts)
+
+        cursor = fake_conn.connection.driver_connection.cursor.return_value.__enter__.return_value
+        copy = cursor.copy.return_value.__enter__.return_value
+        first_row = "".join(c[0][0] for c in copy.write.call_args_list).splitlines()[0]
+
+        # Unquoted empty field is NULL in COPY CSV format
+        assert first_row.split(",")[FactLoader.FACT_COLUMNS.index("trips_daily")] == ""
+
+    @pytest.mark.edge_case
+    @patch("src.loader.create_engine")
+    def test_load_keeps_last_duplicate_fact(self, mock_create_engine, mock_config, sample_facts):
+        fake_conn = MagicMock()
+        fake_engine = MagicMock()
+        fake_engine.begin.return_value.__enter__ = MagicMock(return_value=fake_conn)
+        fake_engine.begin.return_value.__exit__ = MagicMock(return_value=False)
+        mock_create_engine.return_value = fake_engine
+
+        sample_facts.loc[1, "fact_id"] = sample_facts.loc[0, "fact_id"]
+        FactLoader(mock_config).load(sample_facts)
+
+        cursor = fake_conn.connection.driver_connection.cursor.return_value.__enter__.return_value
+        copy = cursor.copy.return_value.__enter__.return_value
+        rows = "".join(c[0][0] for c in copy.write.call_args_list).splitlines()
+
+        # Staged rows are unique on fact_id; the later row's values win
+        assert len(rows) == 1
+        assert rows[0].split(",")[FactLoader.FACT_COLUMNS.index("trips_daily")] == "20.0"
 
     @pytest.mark.happy_path
     def test_fact_columns_complete(self):
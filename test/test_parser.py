@@ -164,4 +164,28 @@ class TestMetadataParser:
         result = parser.parse()
         
         assert "EmptySection" in result
-        assert len(result["EmptySection"]) == 0
\ No newline at end of file
+        assert len(result["EmptySection"]) == 0
+    
+    @pytest.mark.edge_case
+    def test_empty_file(self, temp_csv):
+        """Test parser returns no sections for an empty file."""
+        path = temp_csv("")
+        
+        parser = MetadataParser(filepath=path)
+        result = parser.parse()
+        
+        assert result == {}
+    
+    @pytest.mark.edge_case
+    @pytest.mark.parametrize("encoding", ["utf-16", "cp1252"])
+    def test_non_utf8_encoding(self, tmp_path, sample_metadata_content, encoding):
+        """Test sections are found in files that are not UTF-8 encoded."""
+        path = tmp_path / "temp.csv"
+        content = sample_metadata_content.replace("t2", "Café")
+        path.write_bytes(content.encode(encoding))
+        
+        parser = MetadataParser(filepath=path, encoding=encoding)
+        result = parser.parse()
+        
+        assert list(result) == ["Header 1", "Header 2", "Header 3"]
+        assert result["Header 1"]["title"].tolist() == ["Header 1", "Café", "t3"]
@@ -120,10 +120,27 @@ class TestFactTransformer:
         assert len(result["fact_id"].iloc[0]) == 32  # MD5 hex length
 
     @pytest.mark.happy_path
-    def test_fact_id_matches_manual_hash(self, raw_fact_df):
-        result = FactTransformer(raw_fact_df).transform()
-        expected = hashlib.md5("TM1|P1|M1|MG1|R1|2023".encode()).hexdigest()
+    @pytest.mark.parametrize("algorithm, digest", [
+        ("md5", hashlib.md5),
+        ("blake2s", lambda data: hashlib.blake2s(data, digest_size=16)),
+    ])
+    def test_fact_id_matches_manual_hash(self, raw_fact_df, algorithm, digest):
+        result = FactTransformer(raw_fact_df, hash_algorithm=algorithm).transform()
+        expected = digest("TM1|P1|M1|MG1|R1|2023".encode()).hexdigest()
         assert result["fact_id"].iloc[0] == expected
+        assert len(expected) == 32
+
+    @pytest.mark.edge_case
+    def test_fact_id_missing_key_hashes_as_nan(self, raw_fact_df):
+        raw = raw_fact_df.assign(TravelMotives=[None])
+        result = FactTransformer(raw).transform()
+        expected = hashlib.md5("nan|P1|M1|MG1|R1|2023".encode()).hexdigest()
+        assert result["fact_id"].iloc[0] == expected
+
+    @pytest.mark.error_handling
+    def test_unknown_hash_algorithm_raises(self, raw_fact_df):
+        with pytest.raises(ValueError):
+            FactTransformer(raw_fact_df, hash_algorithm="sha1")
 
     @pytest.mark.happy_path
     def test_transform_adds_audit_column(self, raw_fact_df):
@@ -179,6 +196,8 @@ class TestFactTransformer:
         result = FactTransformer(df).transform()
         # NaN or None both become NULL in PostgreSQL
         assert pd.isna(result["trips_daily"].iloc[0])
+        # Stays float: NaN -> NULL is left to the COPY loader
+        assert result["trips_daily"].dtype == np.float64
 
     @pytest.mark.edge_case
     def test_handles_nan_as_null(self):
@@ -256,4 +275,20 @@ class TestFactTransformer:
         })
         result = FactTransformer(df).transform()
         assert result["trips_daily"].iloc[0] == 10.5
-        assert isinstance(result["trips_daily"].iloc[0], (float, np.floating))
\ No newline at end of file
+        assert isinstance(result["trips_daily"].iloc[0], (float, np.floating))
+
+    @pytest.mark.edge_case
+    def test_integer_metrics_cast_to_float(self, raw_fact_df):
+        """Test that integer-only metric columns still come out as float."""
+        result = FactTransformer(raw_fact_df).transform()
+        assert result["trips_yearly"].dtype == np.float64
+
+    @pytest.mark.edge_case
+    def test_large_metrics_keep_full_precision(self, raw_fact_df):
+        """Test values that fit NUMERIC(12,2) survive the cast unchanged."""
+        raw = raw_fact_df.assign(
+            DistanceTravelled_5=["1234567.89"], Trips_4=["20000001"]
+        )
+        result = FactTransformer(raw).transform()
+        assert result["distance_yearly"].iloc[0] == 1234567.89
+        assert result["trips_yearly"].iloc[0] == 20000001.0
\ No newline at end of file
@@ -5,11 +5,17 @@ Unit tests for the DataValidator class.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 import pandera as pa
 from pandera.errors import SchemaError
 
-from src.validator import DataValidator, dimension_schema, fact_schema
+from src.validator import (
+    DataValidator,
+    N_FAILURE_CASES,
+    dimension_schema,
+    fact_schema,
+)
 
 
 pytestmark = [
@@ -17,72 +23,109 @@ pytestmark = [
     pytest.mark.unit,
 ]
 
+# Fixed audit timestamp: tests never depend on the wall clock
+_NOW = pd.Timestamp("2024-01-01T00:00:00Z")
+
+# One-row valid dimension, shared by tests that derive broken variants
+_BASE_DIM = pd.DataFrame({
+    "key": ["A"],
+    "title": ["Title A"],
+    "description": ["Desc A"],
+    "ingested_at": [_NOW],
+})
+
 
 # ============== FIXTURES ==============
 
-@pytest.fixture
+# Dimension contents as (keys, titles, descriptions), CBS original names
+_DIM_DATA = {
+    "Population": (
+        ["P1", "P2", "P3"],
+        ["Pop 1", "Pop 2", "Pop 3"],
+        ["Description 1", "Description 2", "Description 3"],
+    ),
+    "TravelMotives": (
+        ["TM1", "TM2"],
+        ["Work", "Leisure"],
+        ["Work travel", "Leisure travel"],
+    ),
+    "TravelModes": (
+        ["M1", "M2", "M3"],
+        ["Car", "Bike", "Train"],
+        ["By car", "By bike", "By train"],
+    ),
+    "Margins": (
+        ["MG1", "MG2"],
+        ["Margin 1", "Margin 2"],
+        ["Margin desc 1", "Margin desc 2"],
+    ),
+    "RegionCharacteristics": (
+        ["R1", "R2"],
+        ["North", "South"],
+        ["Northern region", "Southern region"],
+    ),
+    "Periods": (
+        ["2023JJ00", "2024JJ00"],
+        ["Year 2023", "Year 2024"],
+        ["Full year 2023", "Full year 2024"],
+    ),
+}
+
+
+@pytest.fixture(scope="session")
 def valid_dimensions():
-    """Create valid dimension dataframes with CBS original names."""
-    now = pd.Timestamp.now(tz="UTC")
+    """
+    Create valid dimension dataframes with CBS original names.
+    
+    Built once per session: tests must not mutate it in place (copy the
+    dict, or the one frame they change).
+    """
     return {
-        "Population": pd.DataFrame({
-            "key": ["P1", "P2", "P3"],
-            "title": ["Pop 1", "Pop 2", "Pop 3"],
-            "description": ["Description 1", "Description 2", "Description 3"],
-            "ingested_at": [now, now, now],
-        }),
-        "TravelMotives": pd.DataFrame({
-            "key": ["TM1", "TM2"],
-            "title": ["Work", "Leisure"],
-            "description": ["Work travel", "Leisure travel"],
-            "ingested_at": [now, now],
-        }),
-        "TravelModes": pd.DataFrame({
-            "key": ["M1", "M2", "M3"],
-            "title": ["Car", "Bike", "Train"],
-            "description": ["By car", "By bike", "By train"],
-            "ingested_at": [now, now, now],
-        }),
-        "Margins": pd.DataFrame({
-            "key": ["MG1", "MG2"],
-            "title": ["Margin 1", "Margin 2"],
-            "description": ["Margin desc 1", "Margin desc 2"],
-            "ingested_at": [now, now],
-        }),
-        "RegionCharacteristics": pd.DataFrame({
-            "key": ["R1", "R2"],
-            "title": ["North", "South"],
-            "description": ["Northern region", "Southern region"],
-            "ingested_at": [now, now],
-        }),
-        "Periods": pd.DataFrame({
-            "key": ["2023JJ00", "2024JJ00"],
-            "title": ["Year 2023", "Year 2024"],
-            "description": ["Full year 2023", "Full year 2024"],
-            "ingested_at": [now, now],
-        }),
+        name: pd.DataFrame({
+            "key": np.array(keys, dtype=object),
+            "title": np.array(titles, dtype=object),
+            "description": np.array(descriptions, dtype=object),
+            "ingested_at": pd.DatetimeIndex([_NOW] * len(keys)),
+        })
+        for name, (keys, titles, descriptions) in _DIM_DATA.items()
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def compiled_fact_schema(valid_dimensions):
+    """Fact schema built once per module; its FK key sets are frozen at build."""
+    return fact_schema(valid_dimensions)
+
+
+@pytest.fixture(scope="session")
 def valid_fact():
-    """Create a valid fact dataframe with transformed column names."""
-    now = pd.Timestamp.now(tz="UTC")
+    """
+    Create a valid fact dataframe with transformed column names.
+    
+    Built once per session: tests must not mutate it in place.
+    """
+    # Typed arrays: the constructor takes them as-is, no per-element inference
+    def strings(*values):
+        return np.array(values, dtype=object)
+    
+    def metrics(*values):
+        return np.array(values, dtype=np.float64)
+    
     return pd.DataFrame({
-        "fact_id": ["abc123def456abc123def456abc12345", "def456abc123def456abc123def45678"],
-        "travel_motive_key": ["TM1", "TM2"],
-        "population_key": ["P1", "P2"],
-        "travel_mode_key": ["M1", "M2"],
-        "margin_key": ["MG1", "MG2"],
-        "region_key": ["R1", "R2"],
-        "period_key": ["2023JJ00", "2024JJ00"],
-        "trips_daily": [10.0, 20.0],
-        "distance_daily": [100.5, 200.5],
-        "time_daily": [30.0, 60.0],
-        "trips_yearly": [100.0, 200.0],
-        "distance_yearly": [1000.5, 2000.5],
-        "time_yearly": [300.0, 600.0],
-        "ingested_at": [now, now],
+        "fact_id": strings("abc123def456abc123def456abc12345", "def456abc123def456abc123def45678"),
+        "travel_motive_key": strings("TM1", "TM2"),
+        "population_key": strings("P1", "P2"),
+        "travel_mode_key": strings("M1", "M2"),
+        "margin_key": strings("MG1", "MG2"),
+        "region_key": strings("R1", "R2"),
+        "period_key": strings("2023JJ00", "2024JJ00"),
+        "trips_daily": metrics(10.0, 20.0),
+        "distance_daily": metrics(100.5, 200.5),
+        "time_daily": metrics(30.0, 60.0),
+        "trips_yearly": metrics(100.0, 200.0),
+        "distance_yearly": metrics(1000.5, 2000.5),
+        "time_yearly": metrics(300.0, 600.0),
+        "ingested_at": pd.DatetimeIndex([_NOW, _NOW]),
     })
 
 
@@ -94,54 +137,32 @@ class TestDimensionSchema:
     @pytest.mark.happy_path
     def test_valid_dimension(self):
         """Test schema accepts valid dimension data."""
-        now = pd.Timestamp.now(tz="UTC")
         df = pd.DataFrame({
             "key": ["A", "B", "C"],
             "title": ["Title A", "Title B", "Title C"],
             "description": ["Desc A", "Desc B", "Desc C"],
-            "ingested_at": [now, now, now],
+            "ingested_at": [_NOW, _NOW, _NOW],
         })
         
         result = dimension_schema.validate(df)
         
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3
+        assert result.shape == (3, 4)
     
     @pytest.mark.error_handling
-    def test_missing_key_column(self):
-        """Test schema rejects missing 'key' column."""
-        now = pd.Timestamp.now(tz="UTC")
-        df = pd.DataFrame({
-            "title": ["Title A"],
-            "description": ["Desc A"],
-            "ingested_at": [now],
-        })
-        
+    @pytest.mark.parametrize("drop_col", ["key", "title"])
+    def test_missing_required_column(self, drop_col):
+        """Test schema rejects a dimension missing a required column."""
         with pytest.raises(SchemaError):
-            dimension_schema.validate(df)
-    
-    @pytest.mark.error_handling
-    def test_missing_title_column(self):
-        """Test schema rejects missing 'title' column."""
-        now = pd.Timestamp.now(tz="UTC")
-        df = pd.DataFrame({
-            "key": ["A"],
-            "description": ["Desc A"],
-            "ingested_at": [now],
-        })
-        
-        with pytest.raises(SchemaError):
-            dimension_schema.validate(df)
+            dimension_schema.validate(_BASE_DIM.drop(columns=[drop_col]))
     
     @pytest.mark.error_handling
     def test_duplicate_keys(self):
         """Test schema rejects duplicate keys."""
-        now = pd.Timestamp.now(tz="UTC")
         df = pd.DataFrame({
             "key": ["A", "A", "B"],
             "title": ["Title 1", "Title 2", "Title 3"],
             "description": ["Desc 1", "Desc 2", "Desc 3"],
-            "ingested_at": [now, now, now],
+            "ingested_at": [_NOW, _NOW, _NOW],
         })
         
         with pytest.raises(SchemaError):
@@ -150,12 +171,11 @@ class TestDimensionSchema:
     @pytest.mark.error_handling
     def test_null_key(self):
         """Test schema rejects null key values."""
-        now = pd.Timestamp.now(tz="UTC")
         df = pd.DataFrame({
             "key": ["A", None, "B"],
             "title": ["Title 1", "Title 2", "Title 3"],
             "description": ["Desc 1", "Desc 2", "Desc 3"],
-            "ingested_at": [now, now, now],
+            "ingested_at": [_NOW, _NOW, _NOW],
         })
         
         with pytest.raises(SchemaError):
@@ -164,12 +184,11 @@ class TestDimensionSchema:
     @pytest.mark.error_handling
     def test_null_title(self):
         """Test schema rejects null title values."""
-        now = pd.Timestamp.now(tz="UTC")
         df = pd.DataFrame({
             "key": ["A", "B"],
             "title": ["Title 1", None],
             "description": ["Desc 1", "Desc 2"],
-            "ingested_at": [now, now],
+            "ingested_at": [_NOW, _NOW],
         })
         
         with pytest.raises(SchemaError):
@@ -178,12 +197,11 @@ class TestDimensionSchema:
     @pytest.mark.edge_case
     def test_null_description_allowed(self):
         """Test schema allows null description values."""
-        now = pd.Timestamp.now(tz="UTC")
         df = pd.DataFrame({
             "key": ["A", "B"],
             "title": ["Title 1", "Title 2"],
             "description": ["Desc 1", None],
-            "ingested_at": [now, now],
+            "ingested_at": [_NOW, _NOW],
         })
         
         result = dimension_schema.validate(df)
@@ -208,7 +226,7 @@ class TestValidateDimensions:
     @pytest.mark.error_handling
     def test_one_invalid_dimension_fails_all(self, valid_dimensions):
         """Test validation fails if any dimension is invalid."""
-        invalid = valid_dimensions.copy()
+        invalid = {**valid_dimensions}
         invalid["Population"] = pd.DataFrame({"wrong_column": [1, 2, 3]})
         
         validator = DataValidator(invalid, pd.DataFrame())
@@ -216,21 +234,64 @@ class TestValidateDimensions:
         with pytest.raises(SchemaError):
             validator.validate_dimensions()
     
+    @pytest.mark.error_handling
+    def test_mixed_type_key_fails(self, valid_dimensions):
+        """Test an object key column holding a non-string is rejected."""
+        dimensions = {
+            **valid_dimensions,
+            "Population": _BASE_DIM.assign(key=pd.Series([1], dtype=object)),
+        }
+        
+        validator = DataValidator(dimensions, pd.DataFrame())
+        
+        with pytest.raises(SchemaError) as exc_info:
+            validator.validate_dimensions()
+        
+        assert exc_info.value.column_name == "key"
+    
     @pytest.mark.edge_case
     def test_empty_dimension(self, valid_dimensions):
         """Test validation handles empty dimension."""
-        now = pd.Timestamp.now(tz="UTC")
-        valid_dimensions["Population"] = pd.DataFrame({
-            "key": pd.Series([], dtype=str),
-            "title": pd.Series([], dtype=str),
-            "description": pd.Series([], dtype=str),
-            "ingested_at": pd.Series([], dtype="datetime64[ns, UTC]"),
-        })
+        dimensions = {
+            **valid_dimensions,
+            "Population": pd.DataFrame({
+                "key": pd.Series([], dtype=str),
+                "title": pd.Series([], dtype=str),
+                "description": pd.Series([], dtype=str),
+                "ingested_at": pd.Series([], dtype="datetime64[ns, UTC]"),
+            }),
+        }
         
-        validator = DataValidator(valid_dimensions, pd.DataFrame())
+        validator = DataValidator(dimensions, pd.DataFrame())
         result = validator.validate_dimensions()
         
         assert len(result["Population"]) == 0
+    
+    @pytest.mark.error_handling
+    def test_empty_dimension_missing_column(self, valid_dimensions):
+        """Test an empty dimension still needs every schema column."""
+        dimensions = {
+            **valid_dimensions,
+            "Population": pd.DataFrame({"key": pd.Series([], dtype=str)}),
+        }
+        
+        validator = DataValidator(dimensions, pd.DataFrame())
+        
+        with pytest.raises(SchemaError):
+            validator.validate_dimensions()
+
+    @pytest.mark.error_handling
+    def test_empty_dimension_wrong_dtype(self, valid_dimensions):
+        """Test an empty dimension still needs string key columns."""
+        dimensions = {
+            **valid_dimensions,
+            "Population": _BASE_DIM.iloc[:0].astype({"key": "int64"}),
+        }
+        
+        validator = DataValidator(dimensions, pd.DataFrame())
+        
+        with pytest.raises(SchemaError):
+            validator.validate_dimensions()
 
 
 # ============== FACT SCHEMA TESTS ==============
@@ -239,32 +300,29 @@ class TestFactSchema:
     """Tests for the fact_schema validation."""
     
     @pytest.mark.happy_path
-    def test_valid_fact(self, valid_dimensions, valid_fact):
+    def test_valid_fact(self, compiled_fact_schema, valid_fact):
         """Test schema accepts valid fact data."""
-        schema = fact_schema(valid_dimensions)
-        result = schema.validate(valid_fact)
+        result = compiled_fact_schema.validate(valid_fact)
         
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 2
+        assert result.shape == (2, 14)
     
     @pytest.mark.error_handling
-    @pytest.mark.parametrize("column,dim_key", [
-        ("population_key", "Population"),
-        ("travel_motive_key", "TravelMotives"),
-        ("travel_mode_key", "TravelModes"),
-        ("margin_key", "Margins"),
-        ("region_key", "RegionCharacteristics"),
-        ("period_key", "Periods"),
+    @pytest.mark.parametrize("column", [
+        "population_key",
+        "travel_motive_key",
+        "travel_mode_key",
+        "margin_key",
+        "region_key",
+        "period_key",
     ])
-    def test_invalid_foreign_key(self, valid_dimensions, valid_fact, column, dim_key):
+    def test_invalid_foreign_key(self, compiled_fact_schema, valid_fact, column):
         """Test schema rejects invalid foreign keys."""
-        invalid_fact = valid_fact.copy()
-        invalid_fact.loc[0, column] = "INVALID_KEY"
-        
-        schema = fact_schema(valid_dimensions)
+        invalid_fact = valid_fact.assign(
+            **{column: ["INVALID_KEY", valid_fact[column].iloc[1]]}
+        )
         
         with pytest.raises(SchemaError):
-            schema.validate(invalid_fact)
+            compiled_fact_schema.validate(invalid_fact)
     
     @pytest.mark.edge_case
     @pytest.mark.parametrize("column", [
@@ -275,12 +333,12 @@ class TestFactSchema:
         "distance_yearly",
         "time_yearly",
     ])
-    def test_null_metrics_allowed(self, valid_dimensions, valid_fact, column):
+    def test_null_metrics_allowed(self, compiled_fact_schema, valid_fact, column):
         """Test schema allows null values in metric columns."""
-        valid_fact.loc[0, column] = None
+        # mask keeps the float64 dtype the schema expects
+        fact = valid_fact.assign(**{column: valid_fact[column].mask(valid_fact.index == 0)})
         
-        schema = fact_schema(valid_dimensions)
-        result = schema.validate(valid_fact)
+        result = compiled_fact_schema.validate(fact)
         
         assert len(result) == 2
 
@@ -296,20 +354,112 @@ class TestValidateFact:
         validator = DataValidator(valid_dimensions, valid_fact)
         result = validator.validate_fact()
         
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 2
-    
+        assert result.shape == (2, 14)
+
+    @pytest.mark.happy_path
+    def test_string_dtype_keys_accepted(self, valid_dimensions, valid_fact):
+        """Test string-dtype (Arrow-backed when available) keys validate."""
+        text_cols = ["key", "title", "description"]
+        dims = {
+            name: df.astype(dict.fromkeys(text_cols, "string"))
+            for name, df in valid_dimensions.items()
+        }
+        fk_cols = [c for c in valid_fact.columns if c.endswith("_key")]
+        fact = valid_fact.astype(dict.fromkeys(fk_cols, "string"))
+
+        validator = DataValidator(dims, fact)
+        validator.validate_dimensions()
+        result = validator.validate_fact()
+
+        assert result.shape == (2, 14)
+
     @pytest.mark.error_handling
     def test_invalid_fk_raises_error(self, valid_dimensions, valid_fact):
         """Test validate_fact raises error on invalid FK."""
-        invalid_fact = valid_fact.copy()
-        invalid_fact.loc[0, "population_key"] = "NON_EXISTENT"
+        invalid_fact = valid_fact.assign(
+            population_key=["NON_EXISTENT", valid_fact["population_key"].iloc[1]]
+        )
+        
+        validator = DataValidator(valid_dimensions, invalid_fact)
+        
+        with pytest.raises(SchemaError):
+            validator.validate_fact()
+    
+    @pytest.mark.error_handling
+    def test_invalid_fk_reports_failing_rows(self, valid_dimensions, valid_fact):
+        """Test the error lists the column and failing row indices."""
+        invalid_fact = valid_fact.assign(
+            region_key=[valid_fact["region_key"].iloc[0], "NON_EXISTENT"]
+        )
+        
+        validator = DataValidator(valid_dimensions, invalid_fact)
+        
+        with pytest.raises(SchemaError) as exc_info:
+            validator.validate_fact()
+        
+        assert exc_info.value.column_name == "region_key"
+        assert exc_info.value.failure_cases["index"].tolist() == [1]
+        assert exc_info.value.failure_cases["failure_case"].tolist() == ["NON_EXISTENT"]
+    
+    @pytest.mark.error_handling
+    def test_failure_cases_are_capped(self, valid_dimensions, valid_fact):
+        """Test the error lists at most N_FAILURE_CASES failing rows."""
+        many = pd.concat([valid_fact] * 8, ignore_index=True)
+        invalid_fact = many.assign(region_key="NON_EXISTENT")
+        
+        validator = DataValidator(valid_dimensions, invalid_fact)
+        
+        with pytest.raises(SchemaError) as exc_info:
+            validator.validate_fact()
+        
+        assert len(exc_info.value.failure_cases) == N_FAILURE_CASES
+        assert "(16 rows)" in str(exc_info.value)
+
+    @pytest.mark.happy_path
+    def test_fk_key_sets_reused_across_facts(self, valid_dimensions, valid_fact):
+        """Test FK key sets are built once per dimension frame."""
+        validator = DataValidator({**valid_dimensions}, valid_fact)
+        validator.validate_fact()
+        keys = validator._fk_key_set("Periods")
+
+        validator.fact = valid_fact.copy()
+        validator.validate_fact()
+        assert validator._fk_key_set("Periods") is keys
+
+        validator.dimensions["Periods"] = valid_dimensions["Periods"].copy()
+        validator.validate_fact()
+        assert validator._fk_key_set("Periods") is not keys
+
+    @pytest.mark.error_handling
+    def test_missing_column_raises_error(self, valid_dimensions, valid_fact):
+        """Test validate_fact raises error when a required column is missing."""
+        validator = DataValidator(valid_dimensions, valid_fact.drop(columns=["fact_id"]))
+        
+        with pytest.raises(SchemaError):
+            validator.validate_fact()
+    
+    @pytest.mark.error_handling
+    def test_non_float_metric_raises_error(self, valid_dimensions, valid_fact):
+        """Test validate_fact raises error on a non-float metric column."""
+        invalid_fact = valid_fact.assign(trips_yearly=[100, 200])
         
         validator = DataValidator(valid_dimensions, invalid_fact)
         
         with pytest.raises(SchemaError):
             validator.validate_fact()
 
+    @pytest.mark.error_handling
+    def test_metric_dtype_matches_fact_schema(
+        self, compiled_fact_schema, valid_dimensions, valid_fact
+    ):
+        """Test validate_fact and fact_schema reject the same metric dtype."""
+        invalid_fact = valid_fact.astype({"trips_daily": "float32"})
+
+        with pytest.raises(SchemaError):
+            compiled_fact_schema.validate(invalid_fact)
+        with pytest.raises(SchemaError):
+            DataValidator(valid_dimensions, invalid_fact).validate_fact()
+
 
 # ============== VALIDATE_ALL TESTS ==============
 
@@ -327,7 +477,7 @@ class TestValidateAll:
     @pytest.mark.error_handling
     def test_validate_all_fails_on_invalid_dimension(self, valid_dimensions, valid_fact):
         """Test validate_all fails if dimension is invalid."""
-        invalid = valid_dimensions.copy()
+        invalid = {**valid_dimensions}
         invalid["Margins"] = pd.DataFrame({"bad": [1]})
         
         validator = DataValidator(invalid, valid_fact)
@@ -338,8 +488,9 @@ class TestValidateAll:
     @pytest.mark.error_handling
     def test_validate_all_fails_on_invalid_fact(self, valid_dimensions, valid_fact):
         """Test validate_all fails if fact is invalid."""
-        invalid_fact = valid_fact.copy()
-        invalid_fact.loc[0, "period_key"] = "INVALID"
+        invalid_fact = valid_fact.assign(
+            period_key=["INVALID", valid_fact["period_key"].iloc[1]]
+        )
         
         validator = DataValidator(valid_dimensions, invalid_fact)
         